@@ -0,0 +1,220 @@
+"""HTTP compression: gzip/brotli response encoding and Content-Encoding request decoding."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Responses smaller than this are sent as-is; compression overhead isn't worth it.
+DEFAULT_MINIMUM_SIZE = 1024
+# Upper bound on a decompressed request body, to refuse decompression bombs.
+MAX_DECOMPRESSED_BODY = 32 * 1024 * 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # good ratio at a latency suitable for dynamic responses
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip and decode compressed request bodies.
+
+    Only complete (non-streaming) response bodies of at least ``minimum_size``
+    bytes are compressed. Brotli is preferred when the client accepts both.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding != "identity":
+            try:
+                receive = await _decoded_receive(receive, content_encoding)
+            except _BodyDecodeError as exc:
+                response = PlainTextResponse(exc.detail, status_code=exc.status_code)
+                await response(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")
+            ]
+
+        encoding = _pick_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+def coded_etag(etag: str, encoding: str) -> str:
+    """Strong ETag for the content-coded form of a representation: "v" -> "v-br"."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_variants(etag: str) -> list[str]:
+    """The strong ETag plus every coded form this middleware may issue for it."""
+    return [etag] + [coded_etag(etag, encoding) for encoding in ("gzip", "br")]
+
+
+class _BodyDecodeError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _pick_encoding(accept_encoding: str) -> str | None:
+    """Supported coding with the highest non-zero q-value; brotli wins ties."""
+    q_values: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, *params = item.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_values[token.strip().lower()] = q
+
+    wildcard_q = q_values.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        q = q_values.get(encoding, wildcard_q)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj()
+    elif encoding == "br":
+        return _decompress_brotli(body)
+    else:
+        raise _BodyDecodeError(415, f"Unsupported Content-Encoding: {encoding}")
+
+    out = decompressor.decompress(body, MAX_DECOMPRESSED_BODY + 1)
+    if len(out) > MAX_DECOMPRESSED_BODY:
+        raise _BodyDecodeError(413, "Decompressed request body too large")
+    if not decompressor.eof:
+        raise _BodyDecodeError(400, f"Malformed {encoding} request body")
+    return out
+
+
+def _decompress_brotli(body: bytes) -> bytes:
+    """Decompress incrementally so output never grows past the cap."""
+    decompressor = brotli.Decompressor()
+    out = bytearray()
+    data = body
+    while True:
+        out += decompressor.process(data, output_buffer_limit=MAX_DECOMPRESSED_BODY + 1 - len(out))
+        data = b""
+        if len(out) > MAX_DECOMPRESSED_BODY:
+            raise _BodyDecodeError(413, "Decompressed request body too large")
+        if decompressor.can_accept_more_data():
+            break
+    if not decompressor.is_finished():
+        raise _BodyDecodeError(400, "Malformed br request body")
+    return bytes(out)
+
+
+async def _decoded_receive(receive: Receive, encoding: str) -> Receive:
+    """Read the whole compressed body and return a receive callable yielding it decoded."""
+    chunks = []
+    received = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunk = message.get("body", b"")
+        received += len(chunk)
+        if received > MAX_DECOMPRESSED_BODY:
+            # A compressed body is never legitimately larger than its decoded form
+            raise _BodyDecodeError(413, "Request body too large")
+        chunks.append(chunk)
+        more_body = message.get("more_body", False)
+
+    try:
+        body = _decompress(b"".join(chunks), encoding)
+    except (zlib.error, brotli.error):
+        raise _BodyDecodeError(400, f"Malformed {encoding} request body")
+
+    sent = False
+
+    async def decoded_receive() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return decoded_receive
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            if Headers(raw=message["headers"]).get("content-encoding"):
+                self.passthrough = True
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            # Streaming or small responses are sent uncompressed
+            self.passthrough = True
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        compressed = _compress(body, self.encoding)
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # A strong validator must differ per content coding
+            headers["ETag"] = coded_etag(etag, self.encoding)
+        self.start_message["headers"] = headers.raw
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self._send(self.start_message)
+            self.start_message = None
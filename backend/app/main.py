@@ -3,30 +3,63 @@ from __future__ import annotations
 import json
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-
-from .database import engine, Base, get_db
-from .models import Config
-from .schemas import (
-    ConfigCreate,
-    ConfigUpdate,
-    ConfigResponse,
-    ConfigListItem,
-    ValidateRequest,
-    ValidateResponse,
-    PreviewRequest,
-    PreviewResponse,
-    GraphData,
-)
-from .node_schemas import get_all_schemas
-from .toml_engine import generate_toml, validate_graph
+from .startup import startup_report
+
+with startup_report.importing("fastapi"):
+    from fastapi import APIRouter, FastAPI, HTTPException, Depends, Header, Response
+    from fastapi.middleware.cors import CORSMiddleware
+with startup_report.importing("sqlalchemy.orm"):
+    from sqlalchemy.orm import Session
+    from sqlalchemy.orm.exc import StaleDataError
+
+with startup_report.importing("app.compression"):
+    from .compression import CompressionMiddleware, etag_variants
+with startup_report.importing("app.negotiation"):
+    from .negotiation import (
+        MSGPACK_MEDIA_TYPE,
+        NegotiatedResponse,
+        NegotiatedRoute,
+        negotiated_media_type,
+    )
+with startup_report.importing("app.database"):
+    from .database import init_db, get_db
+with startup_report.importing("app.models"):
+    from .models import Config, Template, ConfigTemplateDependency
+with startup_report.importing("app.schemas"):
+    from .schemas import (
+        ConfigCreate,
+        ConfigUpdate,
+        ConfigResponse,
+        ConfigListItem,
+        ValidateRequest,
+        ValidateResponse,
+        PreviewRequest,
+        PreviewResponse,
+        GraphData,
+        TemplateSpec,
+        TemplateCreate,
+        TemplateUpdate,
+        TemplateResponse,
+        TemplateListItem,
+    )
+with startup_report.importing("app.node_schemas"):
+    from .node_schemas import get_schemas_payload
+with startup_report.importing("app.toml_engine"):
+    from .toml_engine import (
+        TemplateError,
+        generate_toml,
+        validate_graph,
+        template_dependencies,
+        validate_template,
+        forget_template,
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    with startup_report.phase("init_db"):
+        init_db()
+    startup_report.mark_ready()
     yield
 
 
@@ -44,30 +77,145 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# gzip/brotli responses above the size threshold; decodes Content-Encoding request bodies
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# Config, validation and preview endpoints carry graph payloads and can speak
+# application/msgpack as well as JSON
+configs_router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+
+
+class _TemplateStore:
+    """Template access for the TOML engine: a version-only query, full load on cache miss."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def version(self, template_id: str) -> int | None:
+        return self.db.query(Template.version).filter(Template.id == template_id).scalar()
+
+    def load(self, template_id: str) -> TemplateSpec | None:
+        template = self.db.get(Template, template_id)
+        if not template:
+            return None
+        return TemplateSpec(
+            id=template.id,
+            version=template.version,
+            graph_data=GraphData.model_validate_json(template.graph_data),
+            parameters=json.loads(template.parameters or "{}"),
+        )
+
+
+def _compile(graph_data: GraphData, db: Session) -> str:
+    """Generate TOML, expanding template nodes; template errors become 422s."""
+    try:
+        return generate_toml(graph_data, _TemplateStore(db))
+    except TemplateError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+def _sync_template_dependencies(config_id: str, graph_data: GraphData, db: Session) -> None:
+    """Rewrite the dependency index rows for a config."""
+    db.query(ConfigTemplateDependency).filter(ConfigTemplateDependency.config_id == config_id).delete()
+    for template_id in template_dependencies(graph_data):
+        db.add(ConfigTemplateDependency(config_id=config_id, template_id=template_id))
+
+
+def _etag(version: int, media_type: str | None = None) -> str:
+    """Strong ETag for a config version in one media type.
+
+    JSON is "<v>" and MessagePack "<v>.msgpack"; CompressionMiddleware adds a
+    coding suffix ("<v>-br") when it encodes the body.
+    """
+    media_type = media_type or negotiated_media_type()
+    suffix = ".msgpack" if media_type == MSGPACK_MEDIA_TYPE else ""
+    return f'"{version}{suffix}"'
+
+
+def _if_none_match(header: str, version: int) -> bool:
+    """Weak comparison against the representation being served, in any content coding."""
+    current = etag_variants(_etag(version))
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") in current:
+            return True
+    return False
+
+
+def _if_match(header: str, version: int) -> bool:
+    """Strong comparison: only ETags this server issued for the current version match."""
+    issued = {
+        variant
+        for media_type in ("application/json", MSGPACK_MEDIA_TYPE)
+        for variant in etag_variants(_etag(version, media_type))
+    }
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag in issued:
+            return True
+    return False
+
+
+def _check_if_match(if_match: str | None, version: int) -> None:
+    if if_match is not None and not _if_match(if_match, version):
+        raise HTTPException(status_code=412, detail="Config has been modified")
+
 
 # ==================== Schemas API ====================
 
 @app.get("/api/schemas")
 def list_schemas():
     """Return all node type schemas for frontend form rendering."""
-    schemas = get_all_schemas()
-    return [s.model_dump() for s in schemas]
+    return get_schemas_payload()
+
+
+@app.get("/api/startup")
+def startup_timings():
+    """Return the cold-start report: import time per module and lifespan phases."""
+    return startup_report.as_dict()
 
 
 # ==================== Config CRUD ====================
 
-@app.get("/api/configs", response_model=list[ConfigListItem])
+@configs_router.get("/api/configs", response_model=list[ConfigListItem])
 def list_configs(db: Session = Depends(get_db)):
     """List all saved configurations."""
     configs = db.query(Config).order_by(Config.updated_at.desc()).all()
     return configs
 
 
-@app.get("/api/configs/{config_id}", response_model=ConfigResponse)
-def get_config(config_id: str, db: Session = Depends(get_db)):
-    """Get a single configuration with TOML preview."""
+@configs_router.head("/api/configs/{config_id}")
+def head_config(
+    config_id: str,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Return only the ETag of a configuration; reads just the version column."""
+    version = db.query(Config.version).filter(Config.id == config_id).scalar()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Config not found")
+    if if_none_match is not None and _if_none_match(if_none_match, version):
+        return Response(status_code=304, headers={"ETag": _etag(version), "Vary": "Accept"})
+    return Response(status_code=200, headers={"ETag": _etag(version), "Vary": "Accept"})
+
+
+@configs_router.get("/api/configs/{config_id}", response_model=ConfigResponse)
+def get_config(
+    config_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Get a single configuration with TOML preview. Honours If-None-Match with 304."""
+    if if_none_match is not None:
+        # Check the version before loading the (potentially large) graph payload
+        version = db.query(Config.version).filter(Config.id == config_id).scalar()
+        if version is not None and _if_none_match(if_none_match, version):
+            return Response(status_code=304, headers={"ETag": _etag(version), "Vary": "Accept"})
+
     config = db.query(Config).filter(Config.id == config_id).first()
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
@@ -79,16 +227,18 @@ def get_config(config_id: str, db: Session = Depends(get_db)):
         description=config.description,
         graph_data=json.loads(config.graph_data),
         toml_content=config.toml_content,
+        version=config.version,
         created_at=config.created_at,
         updated_at=config.updated_at,
     )
+    response.headers["ETag"] = _etag(config.version)
     return result
 
 
-@app.post("/api/configs", response_model=ConfigResponse, status_code=201)
-def create_config(payload: ConfigCreate, db: Session = Depends(get_db)):
+@configs_router.post("/api/configs", response_model=ConfigResponse, status_code=201)
+def create_config(payload: ConfigCreate, response: Response, db: Session = Depends(get_db)):
     """Create a new configuration. Generates TOML from graph_data."""
-    toml_content = generate_toml(payload.graph_data)
+    toml_content = _compile(payload.graph_data, db)
 
     config = Config(
         name=payload.name,
@@ -97,26 +247,37 @@ def create_config(payload: ConfigCreate, db: Session = Depends(get_db)):
         toml_content=toml_content,
     )
     db.add(config)
+    db.flush()
+    _sync_template_dependencies(config.id, payload.graph_data, db)
     db.commit()
     db.refresh(config)
 
+    response.headers["ETag"] = _etag(config.version)
     return ConfigResponse(
         id=config.id,
         name=config.name,
         description=config.description,
         graph_data=json.loads(config.graph_data),
         toml_content=config.toml_content,
+        version=config.version,
         created_at=config.created_at,
         updated_at=config.updated_at,
     )
 
 
-@app.put("/api/configs/{config_id}", response_model=ConfigResponse)
-def update_config(config_id: str, payload: ConfigUpdate, db: Session = Depends(get_db)):
-    """Update an existing configuration."""
+@configs_router.put("/api/configs/{config_id}", response_model=ConfigResponse)
+def update_config(
+    config_id: str,
+    payload: ConfigUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Update an existing configuration. Honours If-Match with 412."""
     config = db.query(Config).filter(Config.id == config_id).first()
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
+    _check_if_match(if_match, config.version)
 
     if payload.name is not None:
         config.name = payload.name
@@ -124,43 +285,179 @@ def update_config(config_id: str, payload: ConfigUpdate, db: Session = Depends(g
         config.description = payload.description
     if payload.graph_data is not None:
         config.graph_data = payload.graph_data.model_dump_json()
-        config.toml_content = generate_toml(payload.graph_data)
-
-    db.commit()
+        config.toml_content = _compile(payload.graph_data, db)
+        _sync_template_dependencies(config.id, payload.graph_data, db)
+
+    try:
+        db.commit()
+    except StaleDataError:
+        # Another writer bumped the version between our read and this update
+        db.rollback()
+        raise HTTPException(status_code=412, detail="Config has been modified")
     db.refresh(config)
 
+    response.headers["ETag"] = _etag(config.version)
     return ConfigResponse(
         id=config.id,
         name=config.name,
         description=config.description,
         graph_data=json.loads(config.graph_data),
         toml_content=config.toml_content,
+        version=config.version,
         created_at=config.created_at,
         updated_at=config.updated_at,
     )
 
 
-@app.delete("/api/configs/{config_id}", status_code=204)
-def delete_config(config_id: str, db: Session = Depends(get_db)):
-    """Delete a configuration."""
+@configs_router.delete("/api/configs/{config_id}", status_code=204)
+def delete_config(
+    config_id: str,
+    if_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Delete a configuration. Honours If-Match with 412."""
     config = db.query(Config).filter(Config.id == config_id).first()
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
+    _check_if_match(if_match, config.version)
+    db.query(ConfigTemplateDependency).filter(ConfigTemplateDependency.config_id == config_id).delete()
     db.delete(config)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="Config has been modified")
 
 
 # ==================== Validation & Preview ====================
 
-@app.post("/api/configs/validate", response_model=ValidateResponse)
-def validate_config(payload: ValidateRequest):
+@configs_router.post("/api/configs/validate", response_model=ValidateResponse)
+def validate_config(payload: ValidateRequest, db: Session = Depends(get_db)):
     """Validate a graph configuration without saving."""
-    errors = validate_graph(payload.graph_data)
+    errors = validate_graph(payload.graph_data, _TemplateStore(db))
     return ValidateResponse(valid=len(errors) == 0, errors=errors)
 
 
-@app.post("/api/configs/preview", response_model=PreviewResponse)
-def preview_config(payload: PreviewRequest):
+@configs_router.post("/api/configs/preview", response_model=PreviewResponse)
+def preview_config(payload: PreviewRequest, db: Session = Depends(get_db)):
     """Preview the generated TOML output without saving."""
-    toml_content = generate_toml(payload.graph_data)
+    toml_content = _compile(payload.graph_data, db)
     return PreviewResponse(toml_content=toml_content)
+
+
+app.include_router(configs_router)
+
+
+# ==================== Template CRUD ====================
+
+@app.get("/api/templates", response_model=list[TemplateListItem])
+def list_templates(db: Session = Depends(get_db)):
+    """List all sub-pipeline templates."""
+    return db.query(Template).order_by(Template.updated_at.desc()).all()
+
+
+@app.get("/api/templates/{template_id}", response_model=TemplateResponse)
+def get_template(template_id: str, db: Session = Depends(get_db)):
+    """Get a single template."""
+    template = db.get(Template, template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    return TemplateResponse(
+        id=template.id,
+        name=template.name,
+        description=template.description,
+        version=template.version,
+        parameters=json.loads(template.parameters or "{}"),
+        graph_data=json.loads(template.graph_data),
+        created_at=template.created_at,
+        updated_at=template.updated_at,
+    )
+
+
+@app.post("/api/templates", response_model=TemplateResponse, status_code=201)
+def create_template(payload: TemplateCreate, db: Session = Depends(get_db)):
+    """Create a new sub-pipeline template."""
+    errors = validate_template(payload.graph_data)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    template = Template(
+        name=payload.name,
+        description=payload.description,
+        parameters=json.dumps(payload.parameters),
+        graph_data=payload.graph_data.model_dump_json(),
+    )
+    db.add(template)
+    db.commit()
+    db.refresh(template)
+
+    return get_template(template.id, db)
+
+
+@app.put("/api/templates/{template_id}", response_model=TemplateResponse)
+def update_template(template_id: str, payload: TemplateUpdate, db: Session = Depends(get_db)):
+    """Update a template and recompile only the configs that depend on it."""
+    template = db.get(Template, template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    if payload.name is not None:
+        template.name = payload.name
+    if payload.description is not None:
+        template.description = payload.description
+    if payload.graph_data is not None:
+        errors = validate_template(payload.graph_data)
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
+        template.graph_data = payload.graph_data.model_dump_json()
+    if payload.parameters is not None:
+        template.parameters = json.dumps(payload.parameters)
+
+    try:
+        # Flushing bumps the version (version_id_col) or raises StaleDataError
+        # if another writer got there first
+        db.flush()
+        if payload.graph_data is not None or payload.parameters is not None:
+            dependents = (
+                db.query(Config)
+                .join(ConfigTemplateDependency, ConfigTemplateDependency.config_id == Config.id)
+                .filter(ConfigTemplateDependency.template_id == template_id)
+                .all()
+            )
+            for config in dependents:
+                config.toml_content = _compile(GraphData.model_validate_json(config.graph_data), db)
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        forget_template(template_id)
+        raise HTTPException(status_code=409, detail="Template or a dependent config was modified concurrently")
+    except Exception:
+        # Dependents may have been compiled (and cached) under the uncommitted version
+        db.rollback()
+        forget_template(template_id)
+        raise
+    db.refresh(template)
+
+    return get_template(template.id, db)
+
+
+@app.delete("/api/templates/{template_id}", status_code=204)
+def delete_template(template_id: str, db: Session = Depends(get_db)):
+    """Delete a template that is no longer used by any config."""
+    template = db.get(Template, template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+    in_use = (
+        db.query(ConfigTemplateDependency)
+        .filter(ConfigTemplateDependency.template_id == template_id)
+        .first()
+    )
+    if in_use:
+        raise HTTPException(status_code=409, detail="Template is used by one or more configs")
+    db.delete(template)
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Template was modified concurrently")
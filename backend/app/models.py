@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey
 
 from .database import Base
 
@@ -22,5 +22,34 @@ class Config(Base):
     description = Column(String, default="")
     graph_data = Column(Text, nullable=False)  # JSON string
     toml_content = Column(Text, default="")
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=utcnow)
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    # Every UPDATE/DELETE checks and bumps version, so concurrent writers get StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+
+class Template(Base):
+    __tablename__ = "templates"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    name = Column(String, nullable=False)
+    description = Column(String, default="")
+    version = Column(Integer, nullable=False, default=1)
+    parameters = Column(Text, default="{}")  # JSON string: name -> default
+    graph_data = Column(Text, nullable=False)  # JSON string
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    # Expansion caches are keyed by version, so it must never be reused by two writers
+    __mapper_args__ = {"version_id_col": version}
+
+
+class ConfigTemplateDependency(Base):
+    """Dependency index: which configs embed which templates."""
+
+    __tablename__ = "config_template_deps"
+
+    config_id = Column(String, ForeignKey("configs.id"), primary_key=True)
+    template_id = Column(String, ForeignKey("templates.id"), primary_key=True, index=True)
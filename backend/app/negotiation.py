@@ -0,0 +1,99 @@
+"""Content negotiation between JSON and MessagePack for graph payload endpoints."""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+# Whether the current request asked for a MessagePack response (via Accept).
+_respond_msgpack: ContextVar[bool] = ContextVar("respond_msgpack", default=False)
+
+
+def negotiated_media_type() -> str:
+    """Media type the current request's response will be rendered in."""
+    return MSGPACK_MEDIA_TYPE if _respond_msgpack.get() else "application/json"
+
+
+class NegotiatedResponse(JSONResponse):
+    """JSON response that renders as MessagePack when the client accepts it."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._msgpack = _respond_msgpack.get()
+        super().__init__(*args, **kwargs)
+        self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self._msgpack:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack.packb(content)
+        return super().render(content)
+
+
+class MsgpackRequest(Request):
+    """Request whose JSON body is decoded from MessagePack."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Route accepting JSON or MessagePack bodies and answering in the format the client accepts.
+
+    Use together with ``NegotiatedResponse`` as the response class.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if _media_type(request.headers.get("content-type", "")) in _MSGPACK_MEDIA_TYPES:
+                # FastAPI only parses bodies it considers JSON; present the
+                # request as JSON and let MsgpackRequest.json() do the decoding.
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (k, v) for k, v in scope["headers"] if k != b"content-type"
+                ] + [(b"content-type", b"application/json")]
+                request = MsgpackRequest(scope, request.receive)
+
+            token = _respond_msgpack.set(_accepts_msgpack(request.headers.get("accept", "")))
+            try:
+                return await original_route_handler(request)
+            finally:
+                _respond_msgpack.reset(token)
+
+        return route_handler
+
+
+def _media_type(header: str) -> str:
+    return header.split(";", 1)[0].strip().lower()
+
+
+def _accepts_msgpack(accept: str) -> bool:
+    """True if MessagePack is explicitly accepted and not ranked below JSON."""
+    msgpack_q = json_q = 0.0
+    for item in accept.split(","):
+        media_type, *params = item.split(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in _MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
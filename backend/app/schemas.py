@@ -55,6 +55,7 @@ class ConfigResponse(BaseModel):
     description: str
     graph_data: dict[str, Any]
     toml_content: str
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -65,6 +66,55 @@ class ConfigListItem(BaseModel):
     id: str
     name: str
     description: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# --- Template CRUD schemas ---
+
+class TemplateSpec(BaseModel):
+    """A stored sub-graph as seen by the TOML engine during expansion."""
+    id: str
+    version: int
+    graph_data: GraphData
+    parameters: dict[str, Any] = Field(default_factory=dict)  # name -> default (None = required)
+
+
+class TemplateCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    description: str = ""
+    parameters: dict[str, Any] = Field(default_factory=dict)
+    graph_data: GraphData
+
+
+class TemplateUpdate(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=200)
+    description: str | None = None
+    parameters: dict[str, Any] | None = None
+    graph_data: GraphData | None = None
+
+
+class TemplateResponse(BaseModel):
+    id: str
+    name: str
+    description: str
+    version: int
+    parameters: dict[str, Any]
+    graph_data: dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class TemplateListItem(BaseModel):
+    id: str
+    name: str
+    description: str
+    version: int
     created_at: datetime
     updated_at: datetime
 
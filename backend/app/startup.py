@@ -0,0 +1,88 @@
+"""Cold-start instrumentation: import timings per module and lifespan phase timings."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def _process_start() -> tuple[float, str]:
+    """perf_counter() value at process start, and what it was measured from.
+
+    On Linux the process start time comes from /proc (clock-tick resolution);
+    elsewhere we fall back to the moment this module was imported.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime) follows the parenthesised command name
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        return now - max(age, 0.0), "process"
+    except (OSError, ValueError, IndexError):
+        return now, "app.startup import"
+
+
+_PROCESS_T0, _T0_SOURCE = _process_start()
+
+
+class StartupReport:
+    """Collects wall-clock timings (in milliseconds) for the process cold start."""
+
+    def __init__(self) -> None:
+        self.imports: dict[str, float] = {}
+        self.preloaded: list[str] = []
+        self.lifespan: dict[str, float] = {}
+        self.ready_ms: float | None = None
+
+    @contextmanager
+    def importing(self, module: str) -> Iterator[None]:
+        """Time an import block, recorded under the given module name.
+
+        Modules already in sys.modules (e.g. imported by the server or a test
+        client) cost nothing here and are listed as preloaded instead.
+        """
+        if module in sys.modules:
+            self.preloaded.append(module)
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports[module] = _elapsed_ms(t0)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a lifespan phase."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.lifespan[name] = _elapsed_ms(t0)
+
+    def mark_ready(self) -> None:
+        """Record the time from process start until the app is ready to serve."""
+        self.ready_ms = _elapsed_ms(_PROCESS_T0)
+
+    def as_dict(self) -> dict:
+        return {
+            "imports_ms": self.imports,
+            "imports_total_ms": round(sum(self.imports.values()), 3),
+            "preloaded_modules": self.preloaded,
+            "lifespan_ms": self.lifespan,
+            "ready_ms": self.ready_ms,
+            "ready_measured_from": _T0_SOURCE,
+        }
+
+
+def _elapsed_ms(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 3)
+
+
+startup_report = StartupReport()
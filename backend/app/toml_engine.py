@@ -2,22 +2,65 @@
 
 from __future__ import annotations
 
+import json
+import re
+import threading
 import toml
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from typing import Any, NamedTuple, Optional, Protocol
 
-from .schemas import GraphData, Node, Edge
+from pydantic import ValidationError
+
+from .schemas import GraphData, Node, NodeData, Edge, TemplateSpec
 from .node_schemas import get_schema
 
+TEMPLATE_CATEGORY = "template"
+
+
+class TemplateSource(Protocol):
+    """Access to stored templates. ``version`` should be cheap; ``load`` is only called on a cache miss."""
+
+    def version(self, template_id: str) -> Optional[int]: ...
+
+    def load(self, template_id: str) -> Optional[TemplateSpec]: ...
+
+
+class _Expansion(NamedTuple):
+    body: GraphData
+    sections: dict[str, dict]  # compiled TOML section per sub-graph node id
+
 
-def generate_toml(graph_data: GraphData) -> str:
+# Parsed templates keyed by (template id, version), and expanded + compiled
+# bodies keyed by (template id, version, template node config). Editing a
+# template bumps its version, so stale entries simply stop being hit.
+_SPEC_CACHE: OrderedDict[tuple[str, int], TemplateSpec] = OrderedDict()
+_EXPANSION_CACHE: OrderedDict[tuple[str, int, str], _Expansion] = OrderedDict()
+_CACHE_SIZE = 256
+# Sync endpoints run in a thread pool; every cache read, move, insert, evict
+# and forget happens under this lock.
+_CACHE_LOCK = threading.Lock()
+
+_PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+
+class TemplateError(ValueError):
+    """Raised when a template node cannot be expanded."""
+
+
+def generate_toml(graph_data: GraphData, templates: TemplateSource | None = None) -> str:
     """Convert graph_data (nodes + edges) into a TOML configuration string.
 
     The engine:
+    0. Expands template nodes into their stored sub-graphs (requires templates)
     1. Builds a topology from edges to determine data flow order
     2. Groups nodes by category (source, transform, sink)
     3. For each node, creates a TOML section with its type and config
     4. Handles multiple nodes of the same category with array-of-tables or indexed keys
     """
+    precompiled: dict[str, dict] = {}
+    if templates is not None:
+        graph_data, precompiled = _expand(graph_data, templates)
+
     nodes_by_id: dict[str, Node] = {n.id: n for n in graph_data.nodes}
     adjacency: dict[str, list[str]] = defaultdict(list)
     in_degree: dict[str, int] = defaultdict(int)
@@ -50,13 +93,13 @@ def generate_toml(graph_data: GraphData) -> str:
 
         if len(nodes) == 1:
             node = nodes[0]
-            section = _build_node_section(node)
+            section = precompiled.get(node.id) or _build_node_section(node)
             doc[category] = section
         else:
             # Multiple nodes of same category: use indexed keys
             sections = []
             for node in nodes:
-                section = _build_node_section(node)
+                section = precompiled.get(node.id) or _build_node_section(node)
                 sections.append(section)
             doc[category] = sections
 
@@ -111,14 +154,211 @@ def _topological_sort(
     return ordered
 
 
-def validate_graph(graph_data: GraphData) -> list[str]:
-    """Validate the graph_data and return a list of error messages."""
+def validate_template(graph_data: GraphData) -> list[str]:
+    """Validate a template body: a non-empty, acyclic sub-graph of known node types."""
+    if template_dependencies(graph_data):
+        return ["Nested template nodes are not supported."]
+    return validate_graph(graph_data, require_endpoints=False)
+
+
+def template_dependencies(graph_data: GraphData) -> set[str]:
+    """Return the ids of all templates referenced by template nodes in the graph."""
+    return {
+        n.data.node_type
+        for n in graph_data.nodes
+        if n.data.category == TEMPLATE_CATEGORY and n.data.node_type
+    }
+
+
+def expand_templates(graph_data: GraphData, templates: TemplateSource) -> GraphData:
+    """Replace every template node with its parameterised sub-graph.
+
+    A template node has category "template", the template id as node_type and
+    the parameter values as config. Its sub-graph nodes are inlined with ids
+    prefixed by "<template node id>/". Edges into the template node are wired
+    to the sub-graph's entry nodes and edges out of it leave from its exit nodes.
+    """
+    return _expand(graph_data, templates)[0]
+
+
+def _expand(graph_data: GraphData, templates: TemplateSource) -> tuple[GraphData, dict[str, dict]]:
+    """Expand template nodes; also return the memoized TOML sections of inlined nodes by id."""
+    sections: dict[str, dict] = {}
+    template_nodes = {n.id: n for n in graph_data.nodes if n.data.category == TEMPLATE_CATEGORY}
+    if not template_nodes:
+        return graph_data, sections
+
+    nodes: list[Node] = [n for n in graph_data.nodes if n.id not in template_nodes]
+    edges: list[Edge] = []
+    versions: dict[str, Optional[int]] = {}  # one version lookup per template per graph
+    entries: dict[str, list[str]] = {}
+    exits: dict[str, list[str]] = {}
+
+    for node in template_nodes.values():
+        body, body_sections = _expand_template_node(node, templates, versions)
+        prefix = f"{node.id}/"
+        sections.update((prefix + sub_id, section) for sub_id, section in body_sections.items())
+        nodes.extend(n.model_copy(update={"id": prefix + n.id}) for n in body.nodes)
+        edges.extend(
+            e.model_copy(update={"id": prefix + e.id, "source": prefix + e.source, "target": prefix + e.target})
+            for e in body.edges
+        )
+
+        inner_sources = {e.source for e in body.edges}
+        inner_targets = {e.target for e in body.edges}
+        entries[node.id] = [prefix + n.id for n in body.nodes if n.id not in inner_targets]
+        exits[node.id] = [prefix + n.id for n in body.nodes if n.id not in inner_sources]
+
+    # Re-wire outer edges touching a template node to its entry/exit nodes
+    for edge in graph_data.edges:
+        sources = exits.get(edge.source, [edge.source])
+        targets = entries.get(edge.target, [edge.target])
+        if len(sources) == 1 and len(targets) == 1:
+            edges.append(edge.model_copy(update={"source": sources[0], "target": targets[0]}))
+            continue
+        for source in sources:
+            for target in targets:
+                edges.append(
+                    edge.model_copy(update={"id": f"{edge.id}:{source}->{target}", "source": source, "target": target})
+                )
+
+    return GraphData(nodes=nodes, edges=edges), sections
+
+
+def _expand_template_node(
+    node: Node, templates: TemplateSource, versions: dict[str, Optional[int]]
+) -> _Expansion:
+    """Return the parameterised, compiled sub-graph for a template node.
+
+    Memoized per (template version, node config): a hit costs one version
+    lookup; the stored graph is only parsed and compiled on a miss.
+    """
+    template_id = node.data.node_type
+    if template_id and template_id not in versions:
+        versions[template_id] = templates.version(template_id)
+    version = versions.get(template_id)
+    if version is None:
+        raise TemplateError(f"Node '{node.id}': unknown template '{template_id}'.")
+
+    key = (template_id, version, json.dumps(node.data.config, sort_keys=True, default=str))
+    expansion = _cache_get(_EXPANSION_CACHE, key)
+    if expansion is not None:
+        return expansion
+
+    spec = _load_spec(template_id, version, templates)
+    if spec is None:
+        raise TemplateError(f"Node '{node.id}': unknown template '{template_id}'.")
+
+    params = dict(spec.parameters)
+    for name, value in node.data.config.items():
+        if name not in spec.parameters:
+            raise TemplateError(f"Node '{node.id}': unknown parameter '{name}' for template '{template_id}'.")
+        params[name] = value
+    missing = sorted(name for name, value in params.items() if value is None)
+    if missing:
+        raise TemplateError(
+            f"Node '{node.id}': missing template parameter(s) {', '.join(repr(m) for m in missing)}."
+        )
+
+    body_nodes = []
+    for sub in spec.graph_data.nodes:
+        if sub.data.category == TEMPLATE_CATEGORY:
+            raise TemplateError(f"Template '{spec.id}': nested template nodes are not supported.")
+        try:
+            data = NodeData(
+                # A whole-placeholder label keeps the parameter's type; labels are always text
+                label=str(_substitute(sub.data.label, params)),
+                node_type=sub.data.node_type,
+                category=sub.data.category,
+                config=_substitute(sub.data.config, params),
+            )
+        except ValidationError as exc:
+            raise TemplateError(
+                f"Node '{node.id}': template '{template_id}' node '{sub.id}' is invalid after substitution: "
+                f"{exc.errors()[0]['msg']}."
+            )
+        body_nodes.append(sub.model_copy(update={"data": data}))
+    body = GraphData(nodes=body_nodes, edges=list(spec.graph_data.edges))
+    expansion = _Expansion(body, {sub.id: _build_node_section(sub) for sub in body_nodes})
+
+    key = (spec.id, spec.version, key[2])
+    _cache_put(_EXPANSION_CACHE, key, expansion)
+    return expansion
+
+
+def forget_template(template_id: str) -> None:
+    """Drop cached entries for a template, e.g. after a rolled-back edit that was compiled under its new version."""
+    with _CACHE_LOCK:
+        for cache in (_SPEC_CACHE, _EXPANSION_CACHE):
+            for key in [k for k in cache if k[0] == template_id]:
+                del cache[key]
+
+
+def _load_spec(template_id: str, version: int, templates: TemplateSource) -> TemplateSpec | None:
+    spec = _cache_get(_SPEC_CACHE, (template_id, version))
+    if spec is not None:
+        return spec
+    spec = templates.load(template_id)
+    if spec is not None:
+        _cache_put(_SPEC_CACHE, (spec.id, spec.version), spec)
+    return spec
+
+
+def _cache_get(cache: OrderedDict, key: tuple) -> Any:
+    with _CACHE_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key: tuple, value: Any) -> None:
+    with _CACHE_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > _CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _substitute(value: Any, params: dict[str, Any]) -> Any:
+    """Replace ${name} placeholders. A value that is exactly one placeholder keeps the parameter's type."""
+    if isinstance(value, str):
+        match = _PLACEHOLDER.fullmatch(value)
+        if match and match.group(1) in params:
+            return params[match.group(1)]
+        return _PLACEHOLDER.sub(
+            lambda m: str(params[m.group(1)]) if m.group(1) in params else m.group(0), value
+        )
+    if isinstance(value, list):
+        return [_substitute(v, params) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, params) for k, v in value.items()}
+    return value
+
+
+def validate_graph(
+    graph_data: GraphData,
+    templates: TemplateSource | None = None,
+    require_endpoints: bool = True,
+) -> list[str]:
+    """Validate the graph_data and return a list of error messages.
+
+    require_endpoints=False skips the source/sink checks, for template bodies
+    that are a fragment of a pipeline.
+    """
     errors: list[str] = []
 
     if not graph_data.nodes:
         errors.append("Graph must contain at least one node.")
         return errors
 
+    if templates is not None:
+        try:
+            graph_data = expand_templates(graph_data, templates)
+        except TemplateError as exc:
+            errors.append(str(exc))
+            return errors
+
     nodes_by_id = {n.id: n for n in graph_data.nodes}
 
     # Check for duplicate node IDs
@@ -168,9 +408,9 @@ def validate_graph(graph_data: GraphData) -> list[str]:
                     f"Node '{node.id}' ({category}/{node_type}): missing required field '{field.name}'."
                 )
 
-    if not has_source:
+    if require_endpoints and not has_source:
         errors.append("Graph must contain at least one source node.")
-    if not has_sink:
+    if require_endpoints and not has_sink:
         errors.append("Graph must contain at least one sink node.")
 
     # Check for cycles
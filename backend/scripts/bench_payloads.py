@@ -0,0 +1,139 @@
+"""Benchmark graph payload sizes and latency across encodings.
+
+Builds large pipelines, then times config GET and preview POST in-process for
+plain JSON, gzip, brotli and MessagePack (+ brotli). Reports bytes on the wire
+and median latency, plus latency with the transfer time at a given link
+bandwidth added, which is where the byte savings show up end to end.
+
+Usage (from backend/, needs httpx for the test client):
+    python -m scripts.bench_payloads --nodes 500 2000 --bandwidth-mbit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import msgpack
+
+VARIANTS = {
+    "json": {"Accept-Encoding": "identity"},
+    "json+gzip": {"Accept-Encoding": "gzip"},
+    "json+br": {"Accept-Encoding": "br"},
+    "msgpack": {"Accept": "application/msgpack", "Accept-Encoding": "identity"},
+    "msgpack+br": {"Accept": "application/msgpack", "Accept-Encoding": "br"},
+}
+
+
+def build_graph(node_count: int) -> dict:
+    """A source -> N transforms -> sink chain with realistic per-node config."""
+    nodes = [{
+        "id": "source-0",
+        "type": "source",
+        "position": {"x": 0.0, "y": 0.0},
+        "data": {
+            "label": "orders",
+            "category": "source",
+            "node_type": "kafka",
+            "config": {"brokers": ["kafka-1:9092", "kafka-2:9092"], "topic": "orders", "group_id": "ingress"},
+        },
+    }]
+    edges = []
+    for i in range(1, node_count + 1):
+        nodes.append({
+            "id": f"transform-{i}",
+            "type": "transform",
+            "position": {"x": 250.0 * i, "y": 120.0 * (i % 7)},
+            "data": {
+                "label": f"map step {i}",
+                "category": "transform",
+                "node_type": "map",
+                "config": {"expression": f"record.amount * {i} + record.fee", "output_field": f"derived_{i}"},
+            },
+        })
+        edges.append({"id": f"e{i}", "source": nodes[-2]["id"], "target": nodes[-1]["id"]})
+    nodes.append({
+        "id": "sink-0",
+        "type": "sink",
+        "position": {"x": 250.0 * (node_count + 1), "y": 0.0},
+        "data": {
+            "label": "warehouse",
+            "category": "sink",
+            "node_type": "clickhouse",
+            "config": {"host": "clickhouse", "port": 8123, "database": "ingress", "table": "orders"},
+        },
+    })
+    edges.append({"id": "e-sink", "source": nodes[-2]["id"], "target": "sink-0"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def _measure(send, repeat: int) -> tuple[int, float]:
+    samples = []
+    wire_bytes = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = send()
+        samples.append((time.perf_counter() - t0) * 1000)
+        response.raise_for_status()
+        wire_bytes = response.num_bytes_downloaded
+    return wire_bytes, statistics.median(samples)
+
+
+def run(node_counts: list[int], repeat: int, bandwidth_mbit: float) -> None:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    bytes_per_ms = bandwidth_mbit * 1_000_000 / 8 / 1000
+    header = f"{'nodes':>6} {'endpoint':<12} {'variant':<12} {'bytes':>10} {'ratio':>6} {'ms':>8} {'ms@link':>8}"
+
+    with TestClient(app) as client:
+        print(f"link bandwidth: {bandwidth_mbit} Mbit/s")
+        print(header)
+        for count in node_counts:
+            graph = build_graph(count)
+            created = client.post("/api/configs", json={"name": f"bench-{count}", "graph_data": graph}).json()
+            url = f"/api/configs/{created['id']}"
+            body = {"graph_data": graph}
+
+            endpoints = {
+                "GET config": lambda headers: client.get(url, headers=headers),
+                "POST preview": lambda headers: client.post(
+                    "/api/configs/preview",
+                    content=msgpack.packb(body) if "msgpack" in headers.get("Accept", "") else json.dumps(body),
+                    headers={
+                        "Content-Type": headers.get("Accept", "application/json"),
+                        **headers,
+                    },
+                ),
+            }
+            for name, send in endpoints.items():
+                baseline = None
+                for variant, headers in VARIANTS.items():
+                    wire_bytes, ms = _measure(lambda: send(headers), repeat)
+                    baseline = baseline or wire_bytes
+                    total = ms + wire_bytes / bytes_per_ms
+                    print(
+                        f"{count:>6} {name:<12} {variant:<12} {wire_bytes:>10} "
+                        f"{wire_bytes / baseline:>6.2f} {ms:>8.2f} {total:>8.2f}"
+                    )
+            client.delete(url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[200, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--bandwidth-mbit", type=float, default=50.0)
+    args = parser.parse_args()
+
+    # Run against a throwaway database rather than the working one
+    os.chdir(tempfile.mkdtemp(prefix="ingress-bench-"))
+    run(args.nodes, args.repeat, args.bandwidth_mbit)
+
+
+if __name__ == "__main__":
+    main()